@@ -5,7 +5,7 @@ It is a python3 translation of the c++ macdylibbundler utility by Marianne Gagno
 which can be found at https://github.com/auriamg/macdylibbundler
 
 usage: bundler [-h] [-d DEST_DIR] [-p INSTALL_PATH] [-s SEARCH_PATH] [-od]
-               [-cd] [-ns] [-i IGNORE] [-dm] [-nc]
+               [-cd] [-ns] [-i IGNORE] [-dm] [-nc] [-no] [-a ARCH]
                target [target ...]
 
 bundler is a utility that helps bundle dynamic libraries inside macOS app
@@ -32,27 +32,71 @@ options:
   -i, --ignore IGNORE   will ignore libraries in this directory (default: None)
   -dm, --debug-mode     enable debug mode (default: False)
   -nc, --no-color       disable color in logging (default: False)
+  -no, --no-otool-cache
+                        disables caching of otool results between runs
+                        (default: False)
+  -a, --arch ARCH       only read this architecture of universal binaries
+                        (e.g. arm64) (default: None)
 
 e.g: bundler -od -b -d My.app/Contents/libs/ My.app/Contents/MacOS/main
 """
 
 import argparse
-import datetime
+import collections
+import ctypes
+import ctypes.util
+import functools
+import json
 import logging
+import mmap
 import os
+import platform
 import re
+import shlex
 import shutil
+import stat
+import struct
 import subprocess
 import sys
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    from macholib.MachO import MachO
+    from macholib.ptypes import sizeof
+except ImportError:
+    MachO = None
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+) / "dylibbundler"
 
 CAVEAT = ("MAY NOT CORRECTLY HANDLE THIS DEPENDENCY: "
           "Manually check the executable with 'otool -L'")
 
 # type aliases
 Pathlike = str | Path
+# (dependency changes, rpath changes, new id) applied to one file
+InstallNameEdits = Tuple[List[Tuple[str, str]], List[Tuple[str, str]], Optional[str]]
+
+# install name prefixes resolved against the rpaths of the dependent file
+_RPATH_PREFIXES = ("@rpath", "@loader_path")
+_SYSTEM_PREFIXES = ("/usr/lib/", "/System/Library/")
+_PATH_VARIABLES = ("@rpath/", "@loader_path/", "@executable_path/")
+
+# a dylib or rpath load command in `otool -l` output, e.g.
+#           cmd LC_LOAD_DYLIB
+#       cmdsize 56
+#          name /usr/lib/libSystem.B.dylib (offset 24)
+_LOAD_COMMAND_RE = re.compile(
+    rb"^[ \t]*cmd (LC_LOAD_DYLIB|LC_REEXPORT_DYLIB|LC_RPATH)[ \t]*\n"
+    rb"(?:(?![ \t]*cmd ).*\n){0,4}?"
+    rb"[ \t]*(?:name|path) (.*) \(offset \d+\)[ \t]*$",
+    re.MULTILINE,
+)
 
 # ----------------------------------------------------------------------------
 # error handling
@@ -110,20 +154,22 @@ class CustomFormatter(logging.Formatter):
     }
 
     def __init__(self, use_color: bool = True):
+        super().__init__()
         self.use_color = use_color
         self.fmt = "%(delta)s - %(levelname)s - %(name)s.%(funcName)s - %(message)s"
+        # formatters are built once, not per record
+        self._plain = logging.Formatter(self.fmt)
+        self._formatters = {
+            level: logging.Formatter(fmt) for level, fmt in self.FORMATS.items()
+        }
 
     def format(self, record: logging.LogRecord) -> str:
         """Format the log record with color if enabled."""
         if not self.use_color:
-            log_fmt = self.fmt
+            formatter = self._plain
         else:
-            log_fmt = self.FORMATS[record.levelno]
-        duration = datetime.datetime.fromtimestamp(
-            record.relativeCreated / 1000, datetime.UTC
-        )
-        record.delta = duration.strftime("%H:%M:%S")
-        formatter = logging.Formatter(log_fmt)
+            formatter = self._formatters.get(record.levelno, self._plain)
+        record.delta = time.strftime("%H:%M:%S", time.gmtime(record.relativeCreated / 1000))
         return formatter.format(record)
 
 def setup_logging(debug: bool = True, use_color: bool = True) -> None:
@@ -140,12 +186,298 @@ def setup_logging(debug: bool = True, use_color: bool = True) -> None:
         handlers=[stream_handler],
     )
 
+# ----------------------------------------------------------------------------
+# file utilities
+
+@functools.lru_cache(maxsize=None)
+def _load_clonefile():
+    """Load clonefile(2) from libSystem, or return None if it is unavailable."""
+    if sys.platform != "darwin":
+        return None
+    libsystem = ctypes.util.find_library("System")
+    if not libsystem:
+        return None
+    try:
+        clonefile = ctypes.CDLL(libsystem, use_errno=True).clonefile
+    except (OSError, AttributeError):
+        return None
+    clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
+    clonefile.restype = ctypes.c_int
+    return clonefile
+
+def _fast_copy(src: Pathlike, dst: Pathlike) -> None:
+    """Copy a file, as a copy-on-write clone when the filesystem supports it.
+
+    clonefile(2) only copies metadata on APFS. It fails across volumes, on
+    other filesystems or if `dst` exists, in which case the data is copied
+    along with the permission bits only: timestamps and extended attributes
+    are not needed, since the copy is rewritten and signed right after.
+    """
+    clonefile = _load_clonefile()
+    if clonefile is not None and clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+        return
+    shutil.copyfile(src, dst)
+    shutil.copymode(src, dst)
+
+@functools.lru_cache(maxsize=None)
+def _P(path: str) -> Path:
+    """Get a Path for a string, sharing one instance per distinct string.
+
+    The same install names and directories come up for many files.
+    """
+    return Path(path)
+
+@functools.lru_cache(maxsize=None)
+def _ensure_dir(path: Path) -> None:
+    """Create a directory and its parents once per process, if missing."""
+    os.makedirs(path, exist_ok=True)
+
+# existence of files probed during dependency resolution, until
+# _clear_file_caches
+_stat_cache: Dict[str, bool] = {}
+
+# names of the entries of each search path, and of those that are symlinks
+_search_path_listings: Dict[str, Tuple[frozenset, frozenset]] = {}
+
+def _exists(path: Pathlike) -> bool:
+    """Check if a path exists, remembering the answer."""
+    key = str(path)
+    try:
+        return _stat_cache[key]
+    except KeyError:
+        result = _stat_cache[key] = os.path.exists(key)
+        return result
+
+# symlink-free form of the paths resolved during dependency resolution
+_resolved_cache: Dict[str, Path] = {}
+
+def _resolve(path: Pathlike) -> Path:
+    """Resolve symlinks in a path, like `Path.resolve`, remembering the answer.
+
+    Directories are resolved once and shared by their entries, so a library
+    next to an already resolved one costs a single lstat.
+    """
+    key = str(path)
+    try:
+        return _resolved_cache[key]
+    except KeyError:
+        pass
+
+    head, name = os.path.split(key)
+    if not os.path.isabs(key) or not head or head == key or name in ("", ".", ".."):
+        resolved = _P(os.path.realpath(key))
+    else:
+        candidate = os.path.join(_resolve(head), name)
+        if os.path.islink(candidate):
+            resolved = _P(os.path.realpath(candidate))
+        else:
+            resolved = _P(candidate)
+    _resolved_cache[key] = resolved
+    return resolved
+
+def _in_search_path(search_path: Pathlike, filename: str) -> bool:
+    """Check if a search path contains a file, listing the directory only once.
+
+    `filename` may also be a relative path, which is probed directly.
+    """
+    key = str(search_path)
+    if os.sep in filename:
+        return _exists(os.path.join(key, filename))
+    listing = _search_path_listings.get(key)
+    if listing is None:
+        names, symlinks = set(), set()
+        try:
+            with os.scandir(key) as entries:
+                for entry in entries:
+                    names.add(entry.name)
+                    # the entry type comes with the listing, no stat needed
+                    if entry.is_symlink():
+                        symlinks.add(entry.name)
+        except OSError:
+            pass
+        listing = _search_path_listings[key] = (frozenset(names), frozenset(symlinks))
+    names, symlinks = listing
+    if filename not in names:
+        return False
+    # a listed symlink may still be dangling
+    return filename not in symlinks or _exists(os.path.join(key, filename))
+
+def _clear_file_caches() -> None:
+    """Forget the cached existence, listing and symlink answers.
+
+    Called when a bundler is created and after it changes the filesystem, so
+    that a later instance in the same process never sees stale answers.
+    """
+    _stat_cache.clear()
+    _search_path_listings.clear()
+    _resolved_cache.clear()
+    _ensure_dir.cache_clear()
+
+def _is_rpath(path: Pathlike) -> bool:
+    """Check if a path is relative to an rpath or to the loading binary."""
+    return str(path).startswith(_RPATH_PREFIXES)
+
+def _first_per_old_name(pairs: Optional[List[Tuple[str, str]]]) -> List[Tuple[str, str]]:
+    """Drop (old, new) pairs whose old name already appeared earlier."""
+    seen = set()
+    unique = []
+    for old, new in pairs or []:
+        if old not in seen:
+            seen.add(old)
+            unique.append((old, new))
+    return unique
+
+def _strip_path_variable(path: str) -> str:
+    """Remove a leading @rpath/, @loader_path/ or @executable_path/ from a path."""
+    if path.startswith(_PATH_VARIABLES):
+        return path.split("/", 1)[1]
+    return path
+
+def _split_for_arg_max(files: List[Path], command: List[str]) -> List[List[Path]]:
+    """Split files into groups that each fit on one command line after `command`.
+
+    Half of ARG_MAX is used, leaving the other half to the environment.
+    """
+    try:
+        budget = os.sysconf("SC_ARG_MAX") // 2
+    except (AttributeError, ValueError, OSError):
+        budget = 128 * 1024
+    budget -= sum(len(os.fsencode(arg)) + 1 for arg in command)
+
+    chunks: List[List[Path]] = [[]]
+    used = 0
+    for file in files:
+        size = len(os.fsencode(file)) + 1 + 8  # the string, its NUL and argv pointer
+        if chunks[-1] and used + size > budget:
+            chunks.append([])
+            used = 0
+        chunks[-1].append(file)
+        used += size
+    return chunks
+
+def _normalized_prefixes(prefixes: List[Path]) -> Set[str]:
+    """Normalize prefixes to strings for set lookups."""
+    return {os.path.normpath(p) for p in prefixes}
+
+def _make_writable(path: Pathlike) -> None:
+    """Add user write permission to a file if it is missing."""
+    mode = os.stat(path).st_mode
+    if not mode & stat.S_IWUSR:
+        os.chmod(path, mode | stat.S_IWUSR)
+
+# ----------------------------------------------------------------------------
+# Mach-O parsing
+
+_MH_MAGIC = {  # the first four bytes of a thin Mach-O file
+    b"\xce\xfa\xed\xfe": ("<", 28),  # 32-bit, little endian
+    b"\xcf\xfa\xed\xfe": ("<", 32),  # 64-bit, little endian
+    b"\xfe\xed\xfa\xce": (">", 28),  # 32-bit, big endian
+    b"\xfe\xed\xfa\xcf": (">", 32),  # 64-bit, big endian
+}
+_FAT_MAGIC = b"\xca\xfe\xba\xbe"
+_FAT_MAGIC_64 = b"\xca\xfe\xba\xbf"
+
+_CPU_TYPES = {"arm64": 0x0100000C, "x86_64": 0x01000007}
+
+# the load commands reported by `otool -l` parsing, see _LOAD_COMMAND_RE
+_LC_LOAD_DYLIB = 0xC
+_LC_REEXPORT_DYLIB = 0x8000001F
+_LC_RPATH = 0x8000001C
+
+def _read_thin_load_commands(
+    data: mmap.mmap, offset: int, cputype: Optional[int]
+) -> Optional[Tuple[List[str], List[Path]]]:
+    """Read the dylib and rpath load commands of the Mach-O image at `offset`.
+
+    Returns None if the image is not a Mach-O file of the wanted CPU type.
+
+    Raises:
+        struct.error: If the load commands run past the end of the data
+    """
+    layout = _MH_MAGIC.get(data[offset:offset + 4])
+    if layout is None:
+        return None
+    endian, header_size = layout
+    image_cputype, _, _, ncmds, sizeofcmds = struct.unpack_from(endian + "iiiII", data, offset + 4)
+    if cputype is not None and image_cputype != cputype:
+        return None
+
+    dep_paths: List[str] = []
+    rpaths: List[Path] = []
+    position = offset + header_size
+    end = position + sizeofcmds
+    for _ in range(ncmds):
+        cmd, cmdsize = struct.unpack_from(endian + "II", data, position)
+        if cmdsize < 8 or position + cmdsize > end:
+            raise struct.error("load command out of bounds")
+        if cmd in (_LC_LOAD_DYLIB, _LC_REEXPORT_DYLIB, _LC_RPATH):
+            # only these commands start with the offset of their name
+            (name_offset,) = struct.unpack_from(endian + "I", data, position + 8)
+            if cmdsize < 12 or name_offset >= cmdsize:
+                raise struct.error("load command out of bounds")
+            raw = data[position + name_offset:position + cmdsize].split(b"\0", 1)[0]
+            if cmd == _LC_RPATH:
+                rpaths.append(_P(os.fsdecode(raw)))
+            else:
+                dep_paths.append(os.fsdecode(raw))
+        position += cmdsize
+    return dep_paths, rpaths
+
+def _read_load_commands(
+    filename: Pathlike, arch: Optional[str] = None
+) -> Optional[Tuple[List[str], List[Path]]]:
+    """Read the dylib and rpath load commands of a Mach-O file without otool.
+
+    The file is mapped rather than read. Of a universal binary, the slice of
+    `arch`, or else of the host architecture, is read, as otool does.
+
+    Returns:
+        The same (deps, rpaths) tuple as parsing `otool -l` output, or None
+        if the file should be left to otool: not a Mach-O file, no matching
+        slice, an unknown architecture or a malformed header.
+    """
+    cputype = _CPU_TYPES.get(arch or platform.machine())
+    if arch and cputype is None:
+        return None
+    try:
+        with open(filename, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic = data[:4]
+            if magic in _MH_MAGIC:
+                # otool reads a thin file whatever its architecture, unless one is asked
+                return _read_thin_load_commands(data, 0, cputype if arch else None)
+            if magic not in (_FAT_MAGIC, _FAT_MAGIC_64) or cputype is None:
+                return None
+            (nfat_arch,) = struct.unpack_from(">I", data, 4)
+            entry_format, entry_size = (">iiIII", 20) if magic == _FAT_MAGIC else (">iiQQII", 32)
+            for i in range(nfat_arch):
+                slice_cputype, _, slice_offset = struct.unpack_from(
+                    entry_format, data, 8 + i * entry_size
+                )[:3]
+                if slice_cputype == cputype:
+                    return _read_thin_load_commands(data, slice_offset, cputype)
+            return None
+    except (OSError, ValueError, struct.error):
+        return None
+
 # ----------------------------------------------------------------------------
 # classes
 
 class Dependency:
     """A dependency of a file."""
 
+    # one instance per library and per file using it, so skip the __dict__
+    __slots__ = (
+        "parent",
+        "_paths",
+        "_filename",
+        "_prefix",
+        "_prefix_str",
+        "_new_name",
+        "symlinks",
+        "_symlink_set",
+        "log",
+    )
+
     def __init__(self, parent: "DylibBundler", path: Pathlike, dependent_file: Pathlike):
         """Initialize a new dependency.
 
@@ -159,22 +491,28 @@ class Dependency:
             ConfigurationError: If the dependency configuration is invalid
         """
         self.parent = parent
+        self._paths: Optional[Tuple[Path, Path, str]] = None
         self.filename = ""
         self.prefix = Path()
         self.symlinks: List[Path] = []
+        self._symlink_set: Set[Path] = set()
         self.new_name = ""
         self.log = logging.getLogger(self.__class__.__name__)
 
         # Resolve the original file path
-        path = Path(str(path).strip())
+        path_str = str(path).strip()
+        path = _P(path_str)
         dependent_file = Path(dependent_file)
 
         try:
-            if self._is_rpath(path):
+            if _is_rpath(path_str):
                 original_file = self.search_filename_in_rpaths(path, dependent_file)
+            elif path_str.startswith("@executable_path"):
+                # never bundled, and there is no path to resolve on disk
+                original_file = path
             else:
                 try:
-                    original_file = path.resolve()
+                    original_file = _resolve(path)
                 except OSError as e:
                     raise FileError(f"Cannot resolve path '{path}': {e}")
 
@@ -182,28 +520,25 @@ class Dependency:
             if original_file != path:
                 self.add_symlink(path)
 
-            self.filename = original_file.name
-            self.prefix = original_file.parent
+            prefix, self.filename = os.path.split(original_file)
+            self.prefix = _P(prefix)
 
             # Check if this dependency should be bundled
-            if not self.parent.is_bundled_prefix(self.prefix):
+            if not self.parent.is_bundled_prefix(self._prefix_str):
                 return
 
             # Check if the lib is in a known location
-            if not self.prefix or not (self.prefix / self.filename).exists():
-                if not self.parent.search_paths:
-                    self._init_search_paths()
-
+            if not self.prefix or not _exists(os.path.join(self._prefix_str, self.filename)):
                 # Check if file is contained in one of the paths
                 for search_path in self.parent.search_paths:
-                    if (search_path / self.filename).exists():
-                        self.log.info(f"FOUND {self.filename} in {search_path}")
+                    if _in_search_path(search_path, self.filename):
+                        self.log.info("FOUND %s in %s", self.filename, search_path)
                         self.prefix = search_path
                         break
 
             # If location still unknown, ask user for search path
-            if not self.parent.is_ignored_prefix(self.prefix) and (
-                not self.prefix or not (self.prefix / self.filename).exists()
+            if not self.parent.is_ignored_prefix(self._prefix_str) and (
+                not self.prefix or not _exists(os.path.join(self._prefix_str, self.filename))
             ):
                 self.log.warning("Library %s has an incomplete name (location unknown)",
                                self.filename)
@@ -228,12 +563,11 @@ class Dependency:
             ConfigurationError: If no valid directory is provided
         """
         for search_path in self.parent.search_paths:
-            if (search_path / filename).exists():
+            if _in_search_path(search_path, filename):
                 self.log.info("%s was found. %s", search_path / filename, CAVEAT)
                 return search_path
 
         while True:
-            # sys.stdout.flush()
             prefix = input("Please specify the directory where this library is "
                          "located (or enter 'quit' to abort): ")
 
@@ -242,61 +576,13 @@ class Dependency:
 
             prefix_path = Path(prefix)
             if not (prefix_path / filename).exists():
-                self.log.info(f"{prefix_path / filename} does not exist. Try again")
+                self.log.info("%s does not exist. Try again", prefix_path / filename)
                 continue
 
             self.log.info("%s was found. %s", prefix_path / filename, CAVEAT)
             self.parent.add_search_path(prefix_path)
             return prefix_path
 
-    def _is_rpath(self, path: Path) -> bool:
-        """Check if a path is an rpath.
-
-        Args:
-            path: The path to check
-
-        Returns:
-            True if the path is an rpath, False otherwise
-        """
-        return str(path).startswith("@rpath") or str(path).startswith("@loader_path")
-
-    def _init_search_paths(self) -> None:
-        """Initialize search paths from environment variables."""
-        search_paths: List[Pathlike] = []
-
-        for env_var in [
-            "DYLD_LIBRARY_PATH",
-            "DYLD_FALLBACK_FRAMEWORK_PATH",
-            "DYLD_FALLBACK_LIBRARY_PATH",
-        ]:
-            if env_var in os.environ:
-                paths = os.environ[env_var].split(":")
-                search_paths.extend(Path(p) for p in paths)
-
-        for path in search_paths:
-            self.parent.add_search_path(path)
-
-    def _change_install_name(self, binary_file: Path, old_name: Pathlike, new_name: str) -> None:
-        """Change the install name of a file.
-
-        Args:
-            binary_file: The file to modify
-            old_name: The old install name
-            new_name: The new install name
-
-        Raises:
-            CommandError: If the install_name_tool command fails
-        """
-        command = f'install_name_tool -change "{old_name}" "{new_name}" "{binary_file}"'
-        try:
-            self.parent.run_command(command)
-        except CommandError as e:
-            raise CommandError(
-                f"Failed to change install name for {binary_file}: {e}",
-                e.returncode,
-                e.output
-            )
-
     def _resolve_rpath(self, rpath: Path, file_prefix: Path) -> Optional[Path]:
         """Resolve a single rpath to its full path.
 
@@ -305,20 +591,18 @@ class Dependency:
             file_prefix: The prefix path for @loader_path resolution
 
         Returns:
-            The resolved path if successful, None otherwise
+            The resolved path if the file exists, None otherwise
         """
-        path_to_check = Path()
-        if "@loader_path" in str(rpath):
-            path_to_check = Path(str(rpath).replace("@loader_path/", str(file_prefix)))
-        elif "@rpath" in str(rpath):
-            path_to_check = Path(str(rpath).replace("@rpath/", str(file_prefix)))
-
-        try:
-            fullpath = path_to_check.resolve()
-            self.parent.rpath_to_fullpath[rpath] = fullpath
-            return fullpath
-        except OSError:
+        rpath_str = str(rpath)
+        prefix_str = os.path.join(str(file_prefix), "")
+        if rpath_str.startswith("@loader_path/"):
+            rpath_str = prefix_str + rpath_str[len("@loader_path/"):]
+        elif rpath_str.startswith("@rpath/"):
+            rpath_str = prefix_str + rpath_str[len("@rpath/"):]
+
+        if not _exists(rpath_str):
             return None
+        return _resolve(rpath_str)
 
     def _search_in_rpaths(self, rpath_file: Path, dependent_file: Path) -> Optional[Path]:
         """Search for a file in rpaths.
@@ -330,23 +614,27 @@ class Dependency:
         Returns:
             The resolved path if found, None otherwise
         """
-        file_prefix = dependent_file.parent
-        suffix = re.sub(r"^@[a-z_]+path/", "", str(rpath_file))
-
-        # Check if already resolved
-        if rpath_file in self.parent.rpath_to_fullpath:
-            return self.parent.rpath_to_fullpath[rpath_file]
+        # the same install name can resolve differently per dependent file
+        key = (dependent_file, rpath_file)
+        if key in self.parent.rpath_to_fullpath:
+            return self.parent.rpath_to_fullpath[key]
+        if dependent_file == rpath_file:
+            return None  # no file to resolve against
 
-        # Try to resolve directly
-        if self._resolve_rpath(rpath_file, file_prefix):
-            return self.parent.rpath_to_fullpath[rpath_file]
+        file_prefix = dependent_file.parent
+        suffix = _strip_path_variable(str(rpath_file))
 
-        # Try all rpaths for the dependent file
-        for rpath in self.parent.rpaths_per_file[dependent_file]:
-            if self._resolve_rpath(rpath / suffix, file_prefix):
-                return self.parent.rpath_to_fullpath[rpath_file]
+        # Try to resolve directly, then against each rpath of the dependent file
+        fullpath = self._resolve_rpath(rpath_file, file_prefix)
+        if fullpath is None:
+            for rpath in self.parent.rpaths_per_file.get(dependent_file, []):
+                fullpath = self._resolve_rpath(rpath / suffix, file_prefix)
+                if fullpath is not None:
+                    break
 
-        return None
+        if fullpath is not None:
+            self.parent.rpath_to_fullpath[key] = fullpath
+        return fullpath
 
     def _search_in_search_paths(self, suffix: str) -> Optional[Path]:
         """Search for a file in configured search paths.
@@ -358,7 +646,7 @@ class Dependency:
             The path if found, None otherwise
         """
         for search_path in self.parent.search_paths:
-            if (search_path / suffix).exists():
+            if _in_search_path(search_path, suffix):
                 return search_path / suffix
         return None
 
@@ -372,74 +660,134 @@ class Dependency:
         Returns:
             The resolved path to the file
         """
-        suffix = re.sub(r"^@[a-z_]+path/", "", str(rpath_file))
-
-        # Try to find in rpaths
-        fullpath = self._search_in_rpaths(rpath_file, dependent_file)
-        if fullpath:
+        key = (dependent_file, rpath_file)
+        fullpath = self.parent.rpath_lookup_cache.get(key)
+        if fullpath is not None:
             return fullpath
 
-        # Try to find in search paths
-        fullpath = self._search_in_search_paths(suffix)
-        if fullpath:
-            return fullpath
+        suffix = _strip_path_variable(str(rpath_file))
 
-        # If not found, ask user for help
-        self.log.warning("can't get path for '%s'", rpath_file)
-        fullpath = self._get_user_input_dir_for_file(suffix) / suffix
-        return fullpath.resolve()
+        # Try to find in rpaths, then in search paths
+        fullpath = (
+            self._search_in_rpaths(rpath_file, dependent_file)
+            or self._search_in_search_paths(suffix)
+        )
+
+        if not fullpath:
+            # If not found, ask user for help
+            self.log.warning("can't get path for '%s'", rpath_file)
+            fullpath = _resolve(self._get_user_input_dir_for_file(suffix) / suffix)
+
+        self.parent.rpath_lookup_cache[key] = fullpath
+        return fullpath
+
+    @property
+    def filename(self) -> str:
+        """The name of the library file."""
+        return self._filename
+
+    @filename.setter
+    def filename(self, value: str) -> None:
+        self._filename = value
+        self._paths = None
+
+    @property
+    def prefix(self) -> Path:
+        """The directory the library is found in."""
+        return self._prefix
+
+    @prefix.setter
+    def prefix(self, value: Path) -> None:
+        self._prefix = value
+        self._prefix_str = str(value)
+        self._paths = None
+
+    @property
+    def new_name(self) -> str:
+        """The name of the library in the destination directory."""
+        return self._new_name
+
+    @new_name.setter
+    def new_name(self, value: str) -> None:
+        self._new_name = value
+        self._paths = None
+
+    def _get_paths(self) -> Tuple[Path, Path, str]:
+        """Get the original, install and inner paths, computed once per name change."""
+        if self._paths is None:
+            self._paths = (
+                self.prefix / self.filename,
+                Path(self.parent._dest_dir_str + self.new_name),
+                self.parent.inside_lib_path + self.new_name,
+            )
+        return self._paths
 
     def get_original_path(self) -> Path:
         """Get the original path."""
-        return self.prefix / self.filename
+        return self._get_paths()[0]
 
     def get_install_path(self) -> Path:
         """Get the install path."""
-        return self.parent.dest_dir / self.new_name
+        return self._get_paths()[1]
 
     def get_inner_path(self) -> str:
         """Get the inner path."""
-        return f"{self.parent.inside_lib_path}{self.new_name}"
+        return self._get_paths()[2]
 
     def add_symlink(self, symlink: Path) -> None:
         """Add a symlink."""
-        if symlink not in self.symlinks:
+        if symlink not in self._symlink_set:
+            self._symlink_set.add(symlink)
             self.symlinks.append(symlink)
 
     def get_symlink(self, index: int) -> Path:
         """Get a symlink by index."""
         return self.symlinks[index]
 
+    def copy_file(self) -> None:
+        """Copy the file to its install path."""
+        _ensure_dir(self.get_install_path().parent)
+        _fast_copy(self.get_original_path(), self.get_install_path())
+        # install_name_tool needs to write to the copy
+        _make_writable(self.get_install_path())
+
     def copy_yourself(self) -> None:
-        """Copy the file."""
-        shutil.copy2(self.get_original_path(), self.get_install_path())
-
-        # Fix the lib's inner name
-        command = f'install_name_tool -id "{self.get_inner_path()}" "{self.get_install_path()}"'
-        if subprocess.call(command, shell=True) != 0:
-            self.log.error("An error occurred while trying to change identity of library %s",
-                self.get_install_path())
-            sys.exit(1)
+        """Copy the file and fix the lib's inner name.
+
+        Raises:
+            CommandError: If the install_name_tool command fails
+        """
+        self.copy_file()
+        self.parent.apply_install_name_edits(self.get_install_path(), new_id=self.get_inner_path())
+
+    def get_install_name_changes(self) -> List[Tuple[str, str]]:
+        """Get the (old, new) install names pointing a file at this dependency."""
+        inner_path = self.get_inner_path()
+        changes = [(str(self.get_original_path()), inner_path)]
+        changes.extend((str(symlink), inner_path) for symlink in self.symlinks)
+        return changes
 
     def fix_file_that_depends_on_me(self, file_to_fix: Path) -> None:
-        """Fix dependencies in a file."""
-        self._change_install_name(
-            file_to_fix, self.get_original_path(), self.get_inner_path()
-        )
+        """Fix dependencies in a file.
 
-        # Fix symlinks
-        for symlink in self.symlinks:
-            self._change_install_name(file_to_fix, symlink, self.get_inner_path())
+        Raises:
+            CommandError: If the install_name_tool command fails
+        """
+        self.parent.apply_install_name_edits(file_to_fix, self.get_install_name_changes())
 
     def merge_if_same_as(self, other: "Dependency") -> bool:
         """Compares this dependency with another. If both refer to the same file,
         returns true and merges both entries into one."""
         if other.filename == self.filename:
-            for symlink in self.symlinks:
-                other.add_symlink(symlink)
+            other.merge_symlinks_from(self)
             return True
         return False
 
+    def merge_symlinks_from(self, other: "Dependency") -> None:
+        """Add the symlinks of another dependency on the same file to this one."""
+        for symlink in other.symlinks:
+            self.add_symlink(symlink)
+
     def print(self) -> None:
         """Print the dependency."""
         lines = [f"{self.filename} from {self.prefix}"]
@@ -461,6 +809,8 @@ class DylibBundler:
         files_to_fix: Optional[List[Pathlike]] = None,
         prefixes_to_ignore: Optional[List[Pathlike]] = None,
         search_paths: Optional[List[Pathlike]] = None,
+        cache_dir: Optional[Pathlike] = DEFAULT_CACHE_DIR,
+        arch: Optional[str] = None,
     ):
         """Initialize a new DylibBundler instance.
 
@@ -473,25 +823,52 @@ class DylibBundler:
             files_to_fix: List of files to process
             prefixes_to_ignore: List of prefixes to ignore
             search_paths: List of search paths
+            cache_dir: Directory caching load commands between runs, or None
+            arch: Only read the load commands of this architecture of
+                universal binaries, or None for otool's default
 
         Raises:
             ConfigurationError: If configuration is invalid
         """
+        # the module-level file caches may hold answers from an earlier bundler
+        _clear_file_caches()
         try:
             self.dest_dir = Path(dest_dir)
             self.can_overwrite_dir = overwrite_dir
             self.can_create_dir = create_dir
             self.can_codesign = codesign
-            self.inside_lib_path = inside_lib_path
-            self.files_to_fix = [Path(f) for f in (files_to_fix or [])]
+            # the host does not change between files, so check it once
+            self._is_arm = platform.machine().startswith(("arm", "aarch"))
+            # always ends with a separator, like the C++ tool's inside_lib_path
+            self.inside_lib_path = os.path.join(str(inside_lib_path), "")
+            # string form used to build every dependency's install path
+            self._dest_dir_str = os.path.join(str(self.dest_dir), "")
+            self.files_to_fix: List[Path] = []
+            for file in files_to_fix or []:
+                self.add_file_to_fix(file)
             self.prefixes_to_ignore = [Path(p) for p in (prefixes_to_ignore or [])]
-            self.search_paths = [Path(p) for p in (search_paths or [])]
+            self._ignored_prefix_set = _normalized_prefixes(self.prefixes_to_ignore)
+            self.search_paths = list(dict.fromkeys(Path(p) for p in (search_paths or [])))
+            if not self.search_paths:
+                self._seed_env_search_paths()
 
             self.deps: List[Dependency] = []
             self.deps_per_file: Dict[Path, List[Dependency]] = {}
-            self.deps_collected: Dict[Path, bool] = {}
+            self._deps_by_filename: Dict[str, Dependency] = {}
+            self._deps_per_file_by_filename: Dict[Path, Dict[str, Dependency]] = {}
+            self.deps_collected: Set[Path] = set()
+            # first path each file was collected through, by resolved path
+            self._analyzed: Dict[str, Path] = {}
             self.rpaths_per_file: Dict[Path, List[Path]] = {}
-            self.rpath_to_fullpath: Dict[Path, Path] = {}
+            self.rpath_to_fullpath: Dict[Tuple[Path, Path], Path] = {}
+            # resolved path of each (dependent file, @rpath install name) pair
+            self.rpath_lookup_cache: Dict[Tuple[Path, Path], Path] = {}
+            self._bundled_cache: Dict[str, bool] = {}
+            self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+            self.arch = arch
+            self._otool_command = ["otool", "-arch", arch, "-l"] if arch else ["otool", "-l"]
+            self._otool_cache: Dict[Tuple[str, int], Tuple[List[str], List[Path]]] = {}
+            self._pending_codesign: List[Path] = []
             self.log = logging.getLogger(self.__class__.__name__)
 
             # Validate configuration
@@ -504,49 +881,76 @@ class DylibBundler:
             raise ConfigurationError(f"Failed to initialize DylibBundler: {e}")
 
     def add_search_path(self, path: Pathlike) -> None:
-        """Add a search path."""
-        self.search_paths.append(Path(path))
+        """Add a search path, unless it is already there."""
+        path = Path(path)
+        if path not in self.search_paths:
+            self.search_paths.append(path)
+
+    def _seed_env_search_paths(self) -> None:
+        """Add the search paths given by the dyld environment variables."""
+        for env_var in [
+            "DYLD_LIBRARY_PATH",
+            "DYLD_FALLBACK_FRAMEWORK_PATH",
+            "DYLD_FALLBACK_LIBRARY_PATH",
+        ]:
+            for path in os.environ.get(env_var, "").split(":"):
+                if path:
+                    self.add_search_path(path)
 
     def search_path(self, index: int) -> Path:
         """Get a search path by index."""
         return self.search_paths[index]
 
     def add_file_to_fix(self, path: Pathlike) -> None:
-        """Add a file to fix."""
-        self.files_to_fix.append(Path(path))
+        """Add a file to fix, unless it is already there.
+
+        Files are compared by resolved path, so a symlink to a listed file
+        is not rewritten and signed a second time, concurrently.
+        """
+        path = Path(path)
+        resolved = _resolve(path)
+        if all(_resolve(file) != resolved for file in self.files_to_fix):
+            self.files_to_fix.append(path)
 
     def ignore_prefix(self, prefix: Pathlike) -> None:
         """Ignore a prefix."""
         self.prefixes_to_ignore.append(Path(prefix))
+        self._ignored_prefix_set.add(os.path.normpath(prefix))
+        self._bundled_cache.clear()
 
     def is_system_library(self, prefix: Pathlike) -> bool:
         """Check if a prefix is a system library."""
-        prefix = str(prefix)
-        return prefix.startswith("/usr/lib/") or prefix.startswith("/System/Library/")
+        return str(prefix).startswith(_SYSTEM_PREFIXES)
 
     def is_ignored_prefix(self, prefix: Pathlike) -> bool:
         """Check if a prefix is ignored."""
-        return Path(prefix) in self.prefixes_to_ignore
+        return os.path.normpath(prefix) in self._ignored_prefix_set
 
     def is_bundled_prefix(self, prefix: Pathlike) -> bool:
-        """Check if a prefix is bundled."""
+        """Check if a prefix is bundled.
+
+        Results are cached per prefix until `ignore_prefix` is called.
+        """
         prefix = str(prefix)
-        if ".framework" in prefix:
-            return False
-        if "@executable_path" in prefix:
-            return False
-        if self.is_system_library(prefix):
-            return False
-        if self.is_ignored_prefix(prefix):
-            return False
-        return True
+        try:
+            return self._bundled_cache[prefix]
+        except KeyError:
+            pass
+
+        bundled = not (
+            ".framework" in prefix
+            or "@executable_path" in prefix
+            or self.is_system_library(prefix)
+            or self.is_ignored_prefix(prefix)
+        )
+        self._bundled_cache[prefix] = bundled
+        return bundled
 
-    def run_command(self, command: str, shell: bool = True) -> str:
-        """Run a shell command and return its output.
+    def run_command(self, command: List[str]) -> str:
+        """Run a command and return its output.
 
         Args:
-            command: The command to run
-            shell: Whether to run in a shell
+            command: The command to run, as an argument list
 
         Returns:
             The command output
@@ -554,18 +958,17 @@ class DylibBundler:
         Raises:
             CommandError: If the command fails
         """
-        self.log.debug("%s", command)
+        self.log.debug("%s", shlex.join(command))
         try:
             result = subprocess.run(
                 command,
-                shell=shell,
                 check=True,
                 text=True,
                 capture_output=True
             )
             return result.stdout
         except subprocess.CalledProcessError as e:
-            raise CommandError(command, e.returncode, e.output)
+            raise CommandError(shlex.join(command), e.returncode, e.stdout + e.stderr)
 
     def chmod(self, path: Pathlike, perm: int = 0o777) -> None:
         """Change permission of file"""
@@ -573,165 +976,381 @@ class DylibBundler:
         os.chmod(path, perm)
 
     def collect_dependencies(self, filename: Path) -> None:
-        """Collect dependencies for a given file."""
+        """Collect dependencies for a given file.
+
+        A file reached through another path, e.g. a symlink, shares the
+        results of the path it was first collected through.
+        """
         if filename in self.deps_collected:
             return
 
+        if self.is_system_library(filename):
+            # system libraries only depend on other system libraries
+            self.deps_collected.add(filename)
+            return
+
+        canonical = str(_resolve(filename))
+        first_seen = self._analyzed.get(canonical)
+        if first_seen is not None:
+            self._share_collected(first_seen, filename)
+            return
+        self._analyzed[canonical] = filename
+
         self.collect_rpaths(filename)
-        lines = self._collect_dependency_lines(filename)
 
-        for line in lines:
-            if not line.startswith("\t"):
-                continue  # only lines beginning with a tab interest us
-            if ".framework" in line:
+        for dep_path in self._collect_dependency_lines(filename):
+            if ".framework" in dep_path:
                 continue  # Ignore frameworks, we cannot handle them
-
-            # trim useless info, keep only library name
-            dep_path = line[1 : line.rfind(" (")]
             if self.is_system_library(dep_path):
                 continue
 
             self.add_dependency(dep_path, filename)
 
-        self.deps_collected[filename] = True
+        self.deps_collected.add(filename)
+
+    def _share_collected(self, collected: Path, alias: Path) -> None:
+        """Record the collected dependencies and rpaths of a file for another path to it."""
+        if collected in self.deps_per_file:
+            self.deps_per_file[alias] = self.deps_per_file[collected]
+            self._deps_per_file_by_filename[alias] = self._deps_per_file_by_filename[collected]
+        if collected in self.rpaths_per_file:
+            self.rpaths_per_file[alias] = self.rpaths_per_file[collected]
+        self.deps_collected.add(alias)
+
+    def _run_otool(self, filename: Path) -> bytes:
+        """Run `otool -l` on a file and return its undecoded output.
+
+        Raises:
+            subprocess.CalledProcessError: If otool fails
+        """
+        self.log.debug("otool -l %s", filename)
+        result = subprocess.run(
+            [*self._otool_command, str(filename)],
+            capture_output=True,
+            check=True
+        )
+        return result.stdout
+
+    def _run_otool_batch(self, filenames: List[Path]) -> Dict[Path, bytes]:
+        """Run `otool -l` once on several files and split its output per file.
+
+        otool starts the output of each file with a "<file>:" line. If otool
+        fails on any file, the whole batch is dropped and nothing is returned.
+        """
+        self.log.debug("otool -l on %d files", len(filenames))
+        try:
+            result = subprocess.run(
+                [*self._otool_command, *map(str, filenames)], capture_output=True
+            )
+        except OSError:
+            return {}
+        if result.returncode != 0:
+            return {}
+
+        output = result.stdout
+        headers = [os.fsencode(f) + b":\n" for f in filenames]
+        starts = []
+        pos = 0
+        for header in headers:
+            start = output.find(header, pos)
+            if start < 0 or (start > 0 and output[start - 1:start] != b"\n"):
+                return {}  # unexpected layout
+            starts.append(start)
+            pos = start + len(header)
+
+        ends = starts[1:] + [len(output)]
+        return {
+            filename: output[start + len(header):end]
+            for filename, header, start, end in zip(filenames, headers, starts, ends)
+        }
+
+    def _cache_key(self, filename: Path) -> Tuple[Tuple[str, int], Optional[Path]]:
+        """Get the in-memory cache key and the cache file of a file."""
+        st = os.stat(filename)
+        cache_file = None
+        if self.cache_dir is not None:
+            # a universal binary is read for the host when no arch is given,
+            # so native and Rosetta runs must not share entries
+            arch = self.arch or platform.machine()
+            cache_file = self.cache_dir / f"{st.st_dev}-{st.st_ino}-{st.st_mtime_ns}-{st.st_size}-{arch}.json"
+        return (str(filename), st.st_mtime_ns), cache_file
+
+    def _cached_load_commands(self, filename: Path) -> Optional[Tuple[List[str], List[Path]]]:
+        """Get the load commands of a file from the memory or disk cache, if there."""
+        key, cache_file = self._cache_key(filename)
+        if key in self._otool_cache:
+            return self._otool_cache[key]
+
+        if cache_file is not None:
+            try:
+                with open(cache_file) as f:
+                    cached = json.load(f)
+                result = (cached["deps"], [_P(p) for p in cached["rpaths"]])
+                self._otool_cache[key] = result
+                return result
+            except (OSError, ValueError, KeyError, TypeError):
+                pass  # not cached yet, or unreadable
+        return None
+
+    def _store_load_commands(self, filename: Path, result: Tuple[List[str], List[Path]]) -> None:
+        """Remember the load commands of a file in the memory and disk caches."""
+        key, cache_file = self._cache_key(filename)
+        self._otool_cache[key] = result
+        if cache_file is not None:
+            self._write_cache_file(
+                cache_file, {"deps": result[0], "rpaths": [str(p) for p in result[1]]}
+            )
+
+    def _load_commands(self, filename: Path) -> Tuple[List[str], List[Path]]:
+        """Get the dylib and rpath load commands of a file.
+
+        Mach-O files are read in-process when possible, otool is the fallback.
+        Results are cached per filename and modification time for the run, so
+        that dependencies and rpaths are read from a single otool invocation,
+        and on disk in `cache_dir`, keyed by the identity and modification time
+        of the file and the architecture read, so that unchanged files skip
+        otool on later runs.
+
+        Raises:
+            subprocess.CalledProcessError: If otool fails
+        """
+        result = self._cached_load_commands(filename)
+        if result is None:
+            result = _read_load_commands(filename, self.arch)
+            if result is None:
+                result = self._parse_load_commands(self._run_otool(filename))
+            self._store_load_commands(filename, result)
+        return result
+
+    def _write_cache_file(self, cache_file: Path, data: Dict) -> None:
+        """Atomically write data to a cache file, ignoring failures."""
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=cache_file.parent, suffix=".tmp", delete=False
+            ) as f:
+                json.dump(data, f)
+            os.replace(f.name, cache_file)
+        except OSError as e:
+            self.log.debug("cannot write cache file %s: %s", cache_file, e)
+
+    def _parse_load_commands(self, output: bytes) -> Tuple[List[str], List[Path]]:
+        """Parse the output of `otool -l` in a single regex scan.
+
+        The output is scanned as bytes and only the matched paths are decoded.
+
+        Args:
+            output: The output of `otool -l`
+
+        Returns:
+            A tuple of the LC_LOAD_DYLIB/LC_REEXPORT_DYLIB names and the
+            LC_RPATH paths, in load command order
+        """
+        dep_paths: List[str] = []
+        rpaths: List[Path] = []
+
+        for match in _LOAD_COMMAND_RE.finditer(output):
+            kind, value = match.groups()
+            if kind == b"LC_RPATH":
+                rpaths.append(_P(os.fsdecode(value)))
+            else:
+                dep_paths.append(os.fsdecode(value))
+
+        return dep_paths, rpaths
 
     def _collect_dependency_lines(self, filename: Path) -> List[str]:
-        """Execute otool -l and collect dependency lines."""
-        if not filename.exists():
+        """Collect the install names of the libraries a file depends on."""
+        if not _exists(filename):
             self.log.error("Cannot find file %s to read its dependencies", filename)
             sys.exit(1)
 
-        cmd = f'otool -l "{filename}"'
         try:
-            output = subprocess.check_output(cmd, shell=True, text=True)
+            dep_paths, _ = self._load_commands(filename)
         except subprocess.CalledProcessError:
             self.log.error("Error running otool on %s", filename)
             sys.exit(1)
 
-        lines = []
-        raw_lines = output.split("\n")
-        searching = False
-
-        for line in raw_lines:
-            if "cmd LC_LOAD_DYLIB" in line or "cmd LC_REEXPORT_DYLIB" in line:
-                if searching:
-                    self.log.error("Failed to find name before next cmd")
-                    sys.exit(1)
-                searching = True
-            elif searching:
-                found = line.find("name ")
-                if found != -1:
-                    lines.append("\t" + line[found + 5 :])
-                    searching = False
-
-        return lines
+        return dep_paths
 
     def collect_rpaths(self, filename: Path) -> None:
         """Collect rpaths for a given file."""
-        if not filename.exists():
+        if filename in self.rpaths_per_file:
+            return  # already collected
+
+        if not _exists(filename):
             self.log.warning("can't collect rpaths for nonexistent file '%s'", filename)
             return
 
-        cmd = f'otool -l "{filename}"'
         try:
-            output = subprocess.check_output(cmd, shell=True, text=True)
+            _, rpaths = self._load_commands(filename)
         except subprocess.CalledProcessError:
             return
 
-        lc_lines = output.split("\n")
-        pos = 0
-        read_rpath = False
-
-        while pos < len(lc_lines):
-            line = lc_lines[pos]
-            pos += 1
-
-            if read_rpath:
-                start_pos = line.find("path ")
-                end_pos = line.find(" (")
-                if start_pos == -1 or end_pos == -1:
-                    self.log.warning("Unexpected LC_RPATH format")
-                    continue
-                start_pos += 5
-                rpath = Path(line[start_pos:end_pos])
-                if filename not in self.rpaths_per_file:
-                    self.rpaths_per_file[filename] = []
-                self.rpaths_per_file[filename].append(rpath)
-                read_rpath = False
-                continue
-
-            if "LC_RPATH" in line:
-                read_rpath = True
-                pos += 1
+        # also recorded when empty, so the file is not looked at again;
+        # a repeated LC_RPATH is kept once, in load command order
+        self.rpaths_per_file[filename] = list(dict.fromkeys(rpaths))
 
     def add_dependency(self, path: Pathlike, filename: Path) -> None:
         """Add a new dependency."""
         dep = Dependency(self, path, filename)
 
         # Check if this library was already added to avoid duplicates
-        in_deps = False
-        for existing_dep in self.deps:
-            if dep.merge_if_same_as(existing_dep):
-                in_deps = True
-                break
+        existing_dep = self._deps_by_filename.get(dep.filename)
+        if existing_dep is not None:
+            existing_dep.merge_symlinks_from(dep)
 
         # Check if this library was already added to deps_per_file[filename]
-        in_deps_per_file = False
-        deps_in_file = self.deps_per_file.get(filename, [])
-        for existing_dep in deps_in_file:
-            if dep.merge_if_same_as(existing_dep):
-                in_deps_per_file = True
-                break
-
-        if not self.is_bundled_prefix(dep.prefix):
+        deps_in_file = self._deps_per_file_by_filename.setdefault(filename, {})
+        existing_dep_in_file = deps_in_file.get(dep.filename)
+        if existing_dep_in_file is not None:
+            existing_dep_in_file.merge_symlinks_from(dep)
+
+        if not self.is_bundled_prefix(dep._prefix_str):
             return
 
-        if not in_deps:
+        if existing_dep is None:
             self.deps.append(dep)
-        if not in_deps_per_file:
-            self.deps_per_file[filename] = self.deps_per_file.get(filename, []) + [dep]
+            self._deps_by_filename[dep.filename] = dep
+        if existing_dep_in_file is None:
+            self.deps_per_file.setdefault(filename, []).append(dep)
+            deps_in_file[dep.filename] = dep
+
+    def _prefetch_otool(self, paths: List[Path]) -> None:
+        """Run otool on the given files in concurrent batches to fill the otool cache.
+
+        Files that can be read in-process are read first and skip otool.
+        Each worker runs a single otool on its share of the others. Failures
+        are ignored here; the files of a failed batch are read one by one
+        when their dependencies are collected, which reports the error.
+        """
+        pending = []
+        for path in dict.fromkeys(paths):
+            if path in self.deps_collected or not _exists(path):
+                continue
+            if self._cached_load_commands(path) is not None:
+                continue
+            result = _read_load_commands(path, self.arch)
+            if result is not None:
+                self._store_load_commands(path, result)
+            else:
+                pending.append(path)
+        if len(pending) < 2:
+            return
+
+        workers = min(os.cpu_count() or 1, len(pending))
+        batches = [
+            chunk
+            for i in range(workers)
+            for chunk in _split_for_arg_max(pending[i::workers], self._otool_command)
+        ]
+
+        # threads suffice: the GIL is released while waiting on otool
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for outputs in executor.map(self._run_otool_batch, batches):
+                for filename, output in outputs.items():
+                    self._store_load_commands(filename, self._parse_load_commands(output))
 
     def collect_sub_dependencies(self) -> None:
         """Recursively collect each dependency's dependencies."""
-        n_deps = len(self.deps)
-
-        while True:
-            n_deps = len(self.deps)
-            for dep in self.deps[:n_deps]:
+        queue = collections.deque(self.deps)
+        seen = set(map(str, self.deps_collected))
+
+        while queue:
+            # take every dependency found so far, each is visited once
+            original_paths = []
+            while queue:
+                dep = queue.popleft()
                 original_path = dep.get_original_path()
-                if dep._is_rpath(original_path):
+                key = str(original_path)
+                if key in seen:
+                    continue  # collected already, skip the rpath lookup
+                if _is_rpath(key):
                     original_path = dep.search_filename_in_rpaths(
                         original_path, original_path
                     )
-
+                    key = str(original_path)
+                    if key in seen:
+                        continue
+                seen.add(key)
+                original_paths.append(original_path)
+
+            # scan this layer of the dependency tree in parallel
+            self._prefetch_otool(original_paths)
+            for original_path in original_paths:
+                n_deps = len(self.deps)
                 self.collect_dependencies(original_path)
-
-            if len(self.deps) == n_deps:
-                break  # no more dependencies were added on this iteration, stop searching
+                queue.extend(self.deps[n_deps:])
 
     def process_collected_deps(self) -> None:
         """Process all collected dependencies."""
+        self._prime_caches()
+
         for dep in self.deps:
             dep.print()
 
         self.create_dest_dir()
+        edits = self._collect_install_name_edits()
 
+        # copy serially, so that libraries sharing a name cannot race in dest_dir
         for dep in reversed(self.deps):
             self.log.info("Processing dependency %s", dep.get_install_path())
-            dep.copy_yourself()
-            self.change_lib_paths_on_file(dep.get_install_path())
-            self.fix_rpaths_on_file(dep.get_original_path(), dep.get_install_path())
-            self.adhoc_codesign(dep.get_install_path())
-
-        for file in reversed(self.files_to_fix):
-            self.log.info("Processing %s", file)
-            # try:
-            #     shutil.copy2(file, file)  # to set write permission
-            # except shutil.SameFileError:
-            #     pass
-            self.change_lib_paths_on_file(file)
-            self.fix_rpaths_on_file(file, file)
-            self.adhoc_codesign(file)
+            dep.copy_file()
+
+        # rewriting is independent for each file
+        max_workers = min(8, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self._process_dep, dep, edits[dep.get_install_path()])
+                       for dep in reversed(self.deps)]
+            futures += [executor.submit(self._process_file, file, edits[file])
+                        for file in reversed(self.files_to_fix)]
+            for future in futures:
+                future.result()
+
+        # every file is final now: sign them all with one codesign call
+        self._pending_codesign.extend(dep.get_install_path() for dep in reversed(self.deps))
+        self._pending_codesign.extend(reversed(self.files_to_fix))
+        self.flush_codesign()
+
+    def _prime_caches(self) -> None:
+        """Collect the dependencies of every file that will be modified.
+
+        This is a no-op for files already collected by
+        `collect_sub_dependencies`, and makes sure no otool run is left for
+        the rewrite phase. Libraries found while priming are collected too.
+        """
+        for file in self.files_to_fix:
+            self.collect_dependencies(file)
+        self.collect_sub_dependencies()
+
+    def _collect_install_name_edits(self) -> Dict[Path, InstallNameEdits]:
+        """Gather the install name edits of every file to modify, keyed by that file.
+
+        A bundled library gets the edits of its original, since the copy has
+        the same load commands; no otool run is needed on the copy.
+        """
+        edits: Dict[Path, InstallNameEdits] = {}
+        for dep in self.deps:
+            original_path = dep.get_original_path()
+            edits[dep.get_install_path()] = (
+                self._install_name_changes(original_path),
+                self._rpath_changes(original_path),
+                dep.get_inner_path(),
+            )
+        for file in self.files_to_fix:
+            edits[file] = (self._install_name_changes(file), self._rpath_changes(file), None)
+        return edits
+
+    def _process_dep(self, dep: Dependency, edits: InstallNameEdits) -> None:
+        """Fix a single copied dependency."""
+        self.log.info("Fixing dependencies on %s", dep.get_install_path())
+        self.apply_install_name_edits(dep.get_install_path(), *edits)
+
+    def _process_file(self, file: Path, edits: InstallNameEdits) -> None:
+        """Fix a single file to fix."""
+        self.log.info("Processing %s", file)
+        _make_writable(file)
+        self.log.info("Fixing dependencies on %s", file)
+        self.apply_install_name_edits(file, *edits)
 
     def create_dest_dir(self) -> None:
         """Create the destination directory if needed.
@@ -750,6 +1369,7 @@ class DylibBundler:
                 shutil.rmtree(dest_dir)
             except OSError as e:
                 raise FileError(f"Failed to overwrite destination directory: {e}")
+            _clear_file_caches()
             dest_exists = False
 
         if not dest_exists:
@@ -762,24 +1382,218 @@ class DylibBundler:
             else:
                 raise FileError("Destination directory does not exist and create_dir is False")
 
+    def _install_name_changes(self, file_to_fix: Path) -> List[Tuple[str, str]]:
+        """Get the install name changes needed by a file's dependencies.
+
+        The file's dependencies must have been collected already, see
+        `_prime_caches`.
+        """
+        assert file_to_fix in self.deps_collected, f"dependencies of {file_to_fix} not collected"
+        changes = []
+        for dep in self.deps_per_file.get(file_to_fix, []):
+            changes.extend(dep.get_install_name_changes())
+        return changes
+
+    def _rpath_changes(self, original_file: Path) -> List[Tuple[str, str]]:
+        """Get the rpath changes needed by a file.
+
+        Every rpath would become inside_lib_path, and install_name_tool
+        refuses to create a duplicate rpath. So only the first rpath is
+        changed, and none if the file already has inside_lib_path.
+        """
+        rpaths = self.rpaths_per_file.get(original_file, [])
+        if not rpaths or any(
+            os.path.join(str(rpath), "") == self.inside_lib_path for rpath in rpaths
+        ):
+            return []
+        return [(str(rpaths[0]), self.inside_lib_path)]
+
+    def apply_install_name_edits(
+        self,
+        file_to_fix: Path,
+        changes: Optional[List[Tuple[str, str]]] = None,
+        rpath_changes: Optional[List[Tuple[str, str]]] = None,
+        new_id: Optional[str] = None,
+    ) -> None:
+        """Apply install name edits to a binary with one install_name_tool call.
+
+        When macholib is installed, no rpath has to change and the files are
+        signed afterwards, the load commands are rewritten in-process instead.
+
+        Args:
+            file_to_fix: The file to modify
+            changes: (old, new) pairs of dependency install names
+            rpath_changes: (old, new) pairs of rpaths
+            new_id: The new identity of the file, if it is a library
+
+        If the call fails because of the rpath edits, the error is logged and
+        the other edits are applied without them.
+
+        Raises:
+            CommandError: If the install_name_tool command fails
+        """
+        # install_name_tool rejects an old name given twice, keep the first
+        unique_changes = _first_per_old_name(changes)
+        unique_rpath_changes = _first_per_old_name(rpath_changes)
+
+        if not (unique_changes or unique_rpath_changes or new_id):
+            return  # nothing to change
+
+        # install_name_tool re-signs linker-signed arm64 binaries, macholib
+        # does not, so its rewrite is only safe when codesign runs later
+        if (
+            self.can_codesign
+            and not unique_rpath_changes
+            and self._rewrite_with_macholib(file_to_fix, unique_changes, new_id)
+        ):
+            return
+
+        command = ["install_name_tool"]
+        for old, new in unique_changes:
+            command += ["-change", old, new]
+        if new_id:
+            command += ["-id", new_id]
+        rpath_command = []
+        for old, new in unique_rpath_changes:
+            rpath_command += ["-rpath", old, new]
+        try:
+            self.run_command(command + rpath_command + [str(file_to_fix)])
+        except CommandError:
+            if not rpath_command:
+                raise
+            # a failed rpath edit is not fatal, nor may it cost the file its
+            # other edits
+            self.log.error("An error occurred while trying to fix rpaths of %s", file_to_fix)
+            if len(command) > 1:
+                self.run_command(command + [str(file_to_fix)])
+
+    def _rewrite_with_macholib(
+        self, file_to_fix: Path, changes: List[Tuple[str, str]], new_id: Optional[str]
+    ) -> bool:
+        """Rewrite install names of a binary in-process with macholib.
+
+        Args:
+            file_to_fix: The file to modify
+            changes: (old, new) pairs of dependency install names
+            new_id: The new identity of the file, if it is a library
+
+        Returns:
+            True if the file was rewritten, False if the edits are left to
+            install_name_tool (macholib missing, unreadable file or not
+            enough header room)
+        """
+        if MachO is None:
+            return False
+
+        try:
+            macho = MachO(str(file_to_fix))
+        except Exception as e:  # macholib raises a variety of errors on odd files
+            self.log.debug("macholib cannot read %s: %s", file_to_fix, e)
+            return False
+
+        encoding = sys.getfilesystemencoding()
+        new_names = dict(changes)
+        planned = []
+        for header in macho.headers:
+            # new data per load command index, the id last as macholib does
+            edits = {
+                idx: new_names[install_name].encode(encoding)
+                for idx, _, install_name in header.walkRelocatables()
+                if install_name in new_names
+            }
+            if new_id and header.id_cmd is not None:
+                edits[header.id_cmd] = new_id.encode(encoding)
+
+            # check the room first: macholib prints a warning to stdout as
+            # soon as an edit outgrows the header
+            growth = 0
+            for idx, data in edits.items():
+                lc, cmd, _ = header.commands[idx]
+                # the size rewriteDataForCommand gives the command
+                padded = len(data) + 8 - len(data) % 8
+                growth += sizeof(lc.__class__) + sizeof(cmd.__class__) + padded - lc.cmdsize
+            if (
+                header.low_offset == sys.maxsize  # no section to bound the header
+                or header.total_size + header.sizediff + growth > header.low_offset
+            ):
+                return False  # nothing was changed yet
+            planned.append((header, edits))
+
+        for header, edits in planned:
+            for idx, data in edits.items():
+                header.rewriteDataForCommand(idx, data)
+
+        self.log.debug("macholib rewrite %s", file_to_fix)
+        with open(file_to_fix, "rb+") as f:
+            macho.write(f)
+        return True
+
     def change_lib_paths_on_file(self, file_to_fix: Path) -> None:
         """Change library paths in a file."""
-        if file_to_fix not in self.deps_collected:
-            self.collect_dependencies(file_to_fix)
-
+        changes = self._install_name_changes(file_to_fix)
         self.log.info("Fixing dependencies on %s", file_to_fix)
-        deps_in_file = self.deps_per_file.get(file_to_fix, [])
-        for dep in deps_in_file:
-            dep.fix_file_that_depends_on_me(file_to_fix)
+        self.apply_install_name_edits(file_to_fix, changes)
 
     def fix_rpaths_on_file(self, original_file: Path, file_to_fix: Path) -> None:
         """Fix rpaths in a file."""
-        rpaths_to_fix = self.rpaths_per_file.get(original_file, [])
+        try:
+            self.apply_install_name_edits(file_to_fix, rpath_changes=self._rpath_changes(original_file))
+        except CommandError:
+            self.log.error("An error occurred while trying to fix dependencies of %s", file_to_fix)
+
+    def _codesign_command(self, files: List[Path]) -> List[str]:
+        """Get the ad-hoc codesign command for the given files."""
+        return [
+            "codesign", "--force", "--deep",
+            "--preserve-metadata=entitlements,requirements,flags,runtime",
+            "--sign", "-", *map(str, files),
+        ]
+
+    def flush_codesign(self) -> None:
+        """Sign the files queued in `_pending_codesign` and empty the queue."""
+        files, self._pending_codesign = self._pending_codesign, []
+        self.adhoc_codesign_all(files)
+
+    def adhoc_codesign_all(self, files: List[Path]) -> None:
+        """Apply ad-hoc code signing to several files in concurrent batches.
+
+        codesign hashes files on a single core, so the files are shared out
+        between up to one codesign call per core, each kept within ARG_MAX.
+        If a call fails, the files codesign reported errors for (or all of
+        its files, if none can be told apart) are signed again one by one,
+        with the workaround of `adhoc_codesign`.
+
+        Args:
+            files: The files to sign
+
+        Raises:
+            CommandError: If codesigning fails
+        """
+        if not self.can_codesign or not files:
+            return
 
-        for rpath in rpaths_to_fix:
-            command = f'install_name_tool -rpath "{rpath}" "{self.inside_lib_path}" "{file_to_fix}"'
-            if subprocess.call(command, shell=True) != 0:
-                self.log.error("An error occurred while trying to fix dependencies of %s", file_to_fix)
+        self.log.info("codesign %d files", len(files))
+        workers = min(os.cpu_count() or 1, len(files))
+        batches = [
+            chunk
+            for i in range(workers)
+            for chunk in _split_for_arg_max(files[i::workers], self._codesign_command([]))
+        ]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(self._codesign_batch, batch) for batch in batches]:
+                future.result()
+
+    def _codesign_batch(self, files: List[Path]) -> None:
+        """Sign files with one codesign call, falling back to one by one."""
+        try:
+            self.run_command(self._codesign_command(files))
+        except CommandError as e:
+            self.log.error("An error occurred while applying ad-hoc signatures. "
+                           "Signing files one by one")
+            # codesign reports failures as "<file>: <reason>"
+            failed = [f for f in files if f"{f}: " in (e.output or "")]
+            for file in failed or files:
+                self.adhoc_codesign(file)
 
     def adhoc_codesign(self, file: Path) -> None:
         """Apply ad-hoc code signing to a file.
@@ -794,40 +1608,45 @@ class DylibBundler:
             return
 
         self.log.info("codesign %s", file)
-        sign_command = f'codesign --force --deep --preserve-metadata=entitlements,requirements,flags,runtime --sign - "{file}"'
+        sign_command = self._codesign_command([file])
 
         try:
             self.run_command(sign_command)
         except CommandError:
             self.log.error("An error occurred while applying ad-hoc signature to %s. Attempting workaround", file)
 
+            # touching the file in place is usually enough for codesign to
+            # read it again, and moves no data
             try:
-                machine = self.run_command("machine")
-                is_arm = "arm" in machine
-            except CommandError:
-                is_arm = False
+                _make_writable(file)
+                os.utime(file, None)
+                self.run_command(sign_command)
+                return
+            except (OSError, CommandError) as e:
+                self.log.debug("in-place workaround failed for %s: %s", file, e)
+
+            # only arm needs a fresh copy of the file, and only arm treats
+            # an unsigned binary as fatal
+            if not self._is_arm:
+                self.log.error("An error occurred while applying ad-hoc signature to %s", file)
+                return
 
             try:
                 temp_dir = Path(tempfile.mkdtemp(prefix="dylibbundler."))
                 temp_file = temp_dir / file.name
 
                 # Copy file to temp location
-                shutil.copy2(file, temp_file)
+                _fast_copy(file, temp_file)
                 # Move it back
                 shutil.move(temp_file, file)
                 # Remove temp dir
                 shutil.rmtree(temp_dir)
                 # Try signing again
-                try:
-                    self.run_command(sign_command)
-                except CommandError as e:
-                    if is_arm:
-                        raise CommandError(f"Failed to sign {file} on ARM: {e}", e.returncode, e.output)
-                    self.log.error("An error occurred while applying ad-hoc signature to %s", file)
+                self.run_command(sign_command)
+            except CommandError as e:
+                raise CommandError(f"Failed to sign {file} on ARM: {e}", e.returncode, e.output)
             except Exception as e:
-                if is_arm:
-                    raise CommandError(f"Failed to sign {file} on ARM: {e}", 1)
-                self.log.error(" %s", str(e))
+                raise CommandError(f"Failed to sign {file} on ARM: {e}", 1)
 
     @classmethod
     def commandline(cls) -> None:
@@ -852,6 +1671,8 @@ class DylibBundler:
             opt("-i",  "--ignore", help="will ignore libraries in this directory")
             opt("-dm", "--debug-mode", help="enable debug mode", action="store_true")
             opt("-nc", "--no-color", help="disable color in logging", action="store_true")
+            opt("-no", "--no-otool-cache", help="disables caching of otool results between runs", action="store_true")
+            opt("-a",  "--arch", help="only read this architecture of universal binaries (e.g. arm64)")
 
             args = parser.parse_args()
 
@@ -864,14 +1685,17 @@ class DylibBundler:
                 create_dir = args.create_dir or args.overwrite_dir,
                 codesign = args.no_codesign,
                 inside_lib_path = args.install_path,
-                files_to_fix = [Path(f) for f in args.target],
-                prefixes_to_ignore = [Path(args.ignore)] if args.ignore else [],
-                search_paths = [Path(args.search_path)] if args.search_path else [],
+                files_to_fix = [_P(f) for f in args.target],
+                prefixes_to_ignore = [_P(args.ignore)] if args.ignore else [],
+                search_paths = [_P(args.search_path)] if args.search_path else [],
+                cache_dir = None if args.no_otool_cache else DEFAULT_CACHE_DIR,
+                arch = args.arch,
             )
 
             bundler.log.info("Collecting dependencies")
 
             # Collect dependencies
+            bundler._prefetch_otool(bundler.files_to_fix)
             for file in bundler.files_to_fix:
                 bundler.collect_dependencies(file)
 
@@ -882,7 +1706,7 @@ class DylibBundler:
             logging.error(str(e))
             sys.exit(1)
         except Exception as e:
-            logging.error(f"Unexpected error: {e}")
+            logging.error("Unexpected error: %s", e)
             sys.exit(1)
 
 if __name__ == "__main__":
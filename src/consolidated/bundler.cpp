@@ -585,12 +585,7 @@ void collectDependencies(const std::string& filename)
     std::vector<std::string> lines;
     collectDependencies(filename, lines);
 
-    std::cout << ".";
-    fflush(stdout);
-
     for (const auto& line : lines) {
-        std::cout << ".";
-        fflush(stdout);
         if (line[0] != '\t')
             continue; // only lines beginning with a tab interest us
         if (line.find(".framework") != std::string::npos)
@@ -616,8 +611,6 @@ void collectSubDependencies()
     while (true) {
         dep_amount = deps.size();
         for (size_t n = 0; n < dep_amount; n++) {
-            std::cout << ".";
-            fflush(stdout);
             std::string original_path = deps[n].getOriginalPath();
             if (isRpath(original_path))
                 original_path = searchFilenameInRpaths(original_path);
@@ -625,6 +618,10 @@ void collectSubDependencies()
             collectDependencies(original_path);
         }
 
+        // one dot per dependency scanned, flushed once per pass
+        std::cout << std::string(dep_amount, '.');
+        fflush(stdout);
+
         if (deps.size() == dep_amount)
             break; // no more dependencies were added on this iteration, stop
                    // searching